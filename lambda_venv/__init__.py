@@ -5,14 +5,48 @@
 
 """A package for creating virtualenv layers for AWS lambda python handlers"""
 
+from typing import TYPE_CHECKING, Any
+
 from .version import __version__
+from . import constants, exceptions
 from .constants import *
 from .exceptions import *
-from .util import (
-    create_aws_session,
-    get_aws_caller_identity,
-    get_aws_account,
-    full_name_of_type,
-    full_type,
-  )
-from .layer_venv import LayerVenv
+
+if TYPE_CHECKING:
+  from .util import (
+      create_aws_session,
+      get_aws_caller_identity,
+      get_aws_account,
+      full_name_of_type,
+      full_type,
+    )
+  from .layer_venv import LayerVenv
+
+# These names pull in boto3 and are imported on first access, so that importing
+# the package (e.g., to run the commandline tool) stays fast.
+_lazy_exports = {
+    'create_aws_session': '.util',
+    'get_aws_caller_identity': '.util',
+    'get_aws_account': '.util',
+    'full_name_of_type': '.util',
+    'full_type': '.util',
+    'LayerVenv': '.layer_venv',
+  }
+
+__all__ = [
+    *constants.__all__,
+    *exceptions.__all__,
+    *_lazy_exports,
+  ]
+
+def __getattr__(name: str) -> Any:
+  module_name = _lazy_exports.get(name)
+  if module_name is None:
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+  import importlib
+  value = getattr(importlib.import_module(module_name, __name__), name)
+  globals()[name] = value
+  return value
+
+def __dir__():
+  return sorted(list(globals()) + list(_lazy_exports))
@@ -5,47 +5,322 @@
 
 """Command-line interface for this package"""
 
-import base64
-from math import exp
-from typing import (
-    TYPE_CHECKING, Optional, Sequence, List, Union, Dict, TextIO, Mapping, MutableMapping,
-    cast, Any, Iterator, Iterable, Tuple, ItemsView, ValuesView, KeysView, Type, IO )
+from typing import TYPE_CHECKING, Optional, Sequence, Dict, List, TextIO, Any, Tuple
 
 import logging
-import uuid
-from .logging import logger
 
 import os
 import sys
-import datetime
+import functools
+import codecs
+import math
+import enum
+import re
 import argparse
-import argcomplete # type: ignore[import]
 import json
-from base64 import b64encode, b64decode
-import colorama # type: ignore[import]
-from colorama import Fore, Back, Style
-import subprocess
-from io import TextIOWrapper
-import yaml
-from urllib.parse import urlparse, ParseResult
-import ruamel.yaml # type: ignore[import]
-from io import StringIO
-
-from .exceptions import LambdaVenvError
-from .internal_types import JsonableTypes, Jsonable, JsonableDict, JsonableList
+
+from .internal_types import Jsonable
 from .version import __version__ as pkg_version
-from .util import full_type, create_aws_session
-from .s3_util import (
-    S3Client,
-    generate_presigned_s3_upload_post,
-    upload_file_to_s3_with_signed_post,
-    s3_upload_folder
+
+# boto3, colorama, argcomplete and friends are expensive to import, and most commands never
+# need them. They are imported where they are first used, to keep commandline startup fast.
+if TYPE_CHECKING:
+  from boto3 import Session
+  from .s3_util import S3Client
+
+_json_colors: Optional[Dict[str, str]] = None
+
+def _get_json_colors() -> Dict[str, str]:
+  # ANSI sequences used by _emit_colored_json, built once on first use. The scheme mirrors jq's defaults.
+  global _json_colors
+  if _json_colors is None:
+    from colorama import Fore, Style # type: ignore[import]
+    _json_colors = dict(
+        null=Style.BRIGHT + Fore.BLACK,
+        scalar=Style.NORMAL + Fore.RESET,
+        string=Style.NORMAL + Fore.GREEN,
+        key=Style.BRIGHT + Fore.BLUE,
+        punctuation=Style.BRIGHT + Fore.RESET,
+        reset=Style.RESET_ALL,
+      )
+  return _json_colors
+
+# JSON output policy, shared by both serializers below: keys are sorted, Enums are written as their
+# values, other non-JSON types (including datetimes and dataclasses) are stringified, non-ASCII text is
+# written as-is (escaped later only if the target encoding is not UTF-8), and NaN/Infinity (which are
+# not valid JSON) are written as null.
+
+def _json_default(value: Any) -> Any:
+  if isinstance(value, enum.Enum):
+    return value.value
+  return str(value)
+
+try:
+  import orjson # type: ignore[import]
+
+  # orjson natively serializes datetimes and dataclasses in its own way; hand them to _json_default
+  # instead so output does not depend on which serializer is used
+  _ORJSON_BASE_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+  _ORJSON_COMPACT_OPTIONS = _ORJSON_BASE_OPTIONS
+  _ORJSON_COMPACT_LINE_OPTIONS = _ORJSON_BASE_OPTIONS | orjson.OPT_APPEND_NEWLINE
+  _ORJSON_PRETTY_LINE_OPTIONS = _ORJSON_BASE_OPTIONS | orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+
+  def _dumps_compact(value: Jsonable) -> str:
+    try:
+      return orjson.dumps(value, default=_json_default, option=_ORJSON_COMPACT_OPTIONS).decode('utf-8')
+    except orjson.JSONEncodeError:
+      # orjson rejects some values the stdlib accepts (e.g., integers wider than 64 bits)
+      return _stdlib_dumps(value, compact=True)
+
+  def _dumps_line(value: Jsonable, compact: bool=False) -> bytes:
+    # orjson does indentation in C, and produces UTF-8 directly
+    try:
+      return orjson.dumps(value, default=_json_default, option=_ORJSON_COMPACT_LINE_OPTIONS if compact else _ORJSON_PRETTY_LINE_OPTIONS)
+    except orjson.JSONEncodeError:
+      return (_stdlib_dumps(value, compact=compact) + '\n').encode('utf-8')
+except ImportError:
+  def _dumps_compact(value: Jsonable) -> str:
+    return _stdlib_dumps(value, compact=True)
+
+  def _dumps_line(value: Jsonable, compact: bool=False) -> bytes:
+    return (_stdlib_dumps(value, compact=compact) + '\n').encode('utf-8')
+
+def _replace_nonfinite(value: Any) -> Any:
+  if isinstance(value, float):
+    return value if math.isfinite(value) else None
+  if isinstance(value, dict):
+    return dict((k, _replace_nonfinite(v)) for k, v in value.items())
+  if isinstance(value, (list, tuple)):
+    return [ _replace_nonfinite(v) for v in value ]
+  return value
+
+def _stdlib_dumps(value: Jsonable, compact: bool=False) -> str:
+  # Produces the same text as orjson, for values orjson cannot handle or when it is not installed
+  if compact:
+    kwargs: Dict[str, Any] = dict(separators=(',', ':'))
+  else:
+    kwargs = dict(indent=2)
+  try:
+    return json.dumps(value, sort_keys=True, default=_json_default, ensure_ascii=False, allow_nan=False, **kwargs)
+  except ValueError:
+    # NaN or Infinity somewhere in the value; rare enough to justify a second pass
+    return json.dumps(_replace_nonfinite(value), sort_keys=True, default=_json_default, ensure_ascii=False, allow_nan=False, **kwargs)
+
+_non_ascii_re = re.compile(r'[^\x00-\x7f]')
+
+def _json_escape_char(m: 're.Match[str]') -> str:
+  code = ord(m.group(0))
+  if code < 0x10000:
+    return f'\\u{code:04x}'
+  code -= 0x10000
+  return f'\\u{0xd800 | (code >> 10):04x}\\u{0xdc00 | (code & 0x3ff):04x}'
+
+def _escape_non_ascii(data: str) -> str:
+  # Non-ASCII characters only occur inside JSON strings, where \u escapes are equivalent
+  return _non_ascii_re.sub(_json_escape_char, data)
+
+@functools.lru_cache(maxsize=None)
+def _is_utf8_encoding(encoding: Optional[str]) -> bool:
+  if encoding is None:
+    return False
+  try:
+    return codecs.lookup(encoding).name == 'utf-8'
+  except LookupError:
+    return False
+
+def _needs_ascii_escape(f: TextIO) -> bool:
+  # Streams without an encoding (e.g., io.StringIO) hold any text
+  encoding = getattr(f, 'encoding', None)
+  return encoding is not None and not _is_utf8_encoding(encoding)
+
+# Text streams translate '\n' to os.linesep on write; bytes written to their binary buffer are only
+# equivalent when there is nothing to translate
+_BINARY_NEWLINES_MATCH_TEXT = os.linesep == '\n'
+
+def _write_utf8(f: TextIO, data: bytes) -> None:
+  # Writes UTF-8 encoded JSON to a text stream, bypassing the text layer when the stream's encoding and
+  # newline translation permit
+  buffer = getattr(f, 'buffer', None)
+  if buffer is None or not _BINARY_NEWLINES_MATCH_TEXT or not _is_utf8_encoding(getattr(f, 'encoding', None)):
+    text = data.decode('utf-8')
+    f.write(_escape_non_ascii(text) if _needs_ascii_escape(f) else text)
+    return
+  f.flush()
+  buffer.write(data)
+  if getattr(f, 'line_buffering', False):
+    buffer.flush()
+
+# Loggers that _set_logger_levels restricts to at least INFO level
+_CHATTY_LOGGERS: Tuple[str, ...] = (
+    'botocore.hooks','botocore.parsers','botocore.auth','botocore.endpoint','botocore.httpsession',
+    'botocore.loaders','botocore.retryhandler','botocore.utils','botocore.client',
+    'botocore.session','botocore.handlers','botocore.awsrequest','botocore.regions','urllib3.connectionpool',
+    's3transfer.utils','s3transfer.tasks','s3transfer.futures',
+  )
+
+def _emit_colored_json(f: TextIO, value: Any, compact: bool=False, ascii_only: bool=False, indent_level: int=0) -> None:
+  """Writes a colorized JSON representation of a value to a stream, without a trailing newline.
+
+  The value is walked directly and each token is written with its ANSI color codes inline, so no uncolored
+  intermediate JSON string is built. Keys are sorted, Enums are written as their values, and other
+  non-JSON types are stringified, as with _dumps_compact/_dumps_line.
+
+  Args:
+      f (TextIO): The stream to write to
+      value (Any): The value to write; normally Jsonable
+      compact (bool, optional): True to omit indentation and whitespace. Defaults to False.
+      ascii_only (bool, optional): True to \\u-escape non-ASCII characters in strings. Defaults to False.
+      indent_level (int, optional): The nesting depth of value, used for indentation. Defaults to 0.
+  """
+  if isinstance(value, enum.Enum):
+    # Written as its value, as _json_default does for the serializers
+    _emit_colored_json(f, value.value, compact=compact, ascii_only=ascii_only, indent_level=indent_level)
+    return
+  colors = _get_json_colors()
+  reset = colors['reset']
+  if isinstance(value, (dict, list, tuple)):
+    punctuation = colors['punctuation']
+    is_dict = isinstance(value, dict)
+    open_char, close_char = ('{', '}') if is_dict else ('[', ']')
+    if len(value) == 0:
+      f.write(f"{punctuation}{open_char}{close_char}{reset}")
+      return
+    if compact:
+      child_sep = ''
+      close_sep = ''
+      key_sep = f"{punctuation}:{reset}"
+    else:
+      child_sep = '\n' + '  ' * (indent_level + 1)
+      close_sep = '\n' + '  ' * indent_level
+      key_sep = f"{punctuation}:{reset} "
+    comma = f"{punctuation},{reset}"
+    f.write(f"{punctuation}{open_char}{reset}")
+    first = True
+    if is_dict:
+      key_color = colors['key']
+      for k in sorted(value):
+        key = _dumps_compact(str(k))
+        if ascii_only:
+          key = _escape_non_ascii(key)
+        f.write(f"{'' if first else comma}{child_sep}{key_color}{key}{reset}{key_sep}")
+        _emit_colored_json(f, value[k], compact=compact, ascii_only=ascii_only, indent_level=indent_level + 1)
+        first = False
+    else:
+      for v in value:
+        f.write(f"{'' if first else comma}{child_sep}")
+        _emit_colored_json(f, v, compact=compact, ascii_only=ascii_only, indent_level=indent_level + 1)
+        first = False
+    f.write(f"{close_sep}{punctuation}{close_char}{reset}")
+  elif value is None:
+    f.write(f"{colors['null']}null{reset}")
+  elif isinstance(value, (bool, int, float)):
+    f.write(f"{colors['scalar']}{_dumps_compact(value)}{reset}")
+  else:
+    # Strings, and other non-JSON types such as datetimes and dataclasses, which the serializers
+    # stringify via _json_default
+    data = _dumps_compact(value)
+    if ascii_only:
+      data = _escape_non_ascii(data)
+    f.write(f"{colors['string']}{data}{reset}")
+
+@functools.lru_cache(maxsize=8)
+def _cached_aws_session(aws_profile: Optional[str], aws_region: Optional[str]) -> 'Session':
+  # Creating a boto3 session loads and parses botocore's data files; share one per profile/region
+  # for the life of the process
+  from .util import create_aws_session
+  return create_aws_session(profile_name=aws_profile, region_name=aws_region)
+
+@functools.lru_cache(maxsize=8)
+def _cached_s3(aws_profile: Optional[str], aws_region: Optional[str]) -> 'S3Client':
+  return _cached_aws_session(aws_profile, aws_region).client('s3')
+
+# Logging level names accepted by --loglevel, in order of increasing verbosity
+_LOG_LEVELS: Dict[str, int] = dict(
+    critical=logging.CRITICAL,
+    error=logging.ERROR,
+    warning=logging.WARNING,
+    info=logging.INFO,
+    debug=logging.DEBUG,
   )
-from boto3 import Session
+
+def _parse_loglevel(name: str) -> int:
+  # argparse type converter for --loglevel; resolves the level number once, while parsing
+  try:
+    return _LOG_LEVELS[name.lower()]
+  except KeyError:
+    raise argparse.ArgumentTypeError(f"invalid choice: {name!r} (choose from {', '.join(_LOG_LEVELS)})") from None
+
+def _complete_loglevel(prefix: str, **kwargs) -> List[str]:
+  # argcomplete completer for --loglevel; offers the level names rather than their numbers
+  return [ name for name in _LOG_LEVELS if name.startswith(prefix) ]
+
+def _set_logger_levels(log_level: int) -> None:
+  """Restricts the levels of chatty boto3/urllib3 loggers, given the root logging level.
+
+  Levels are written directly while holding the logging module lock once. The logger manager's
+  level cache is then cleared one time, instead of by each Logger.setLevel() call.
+
+  Args:
+      log_level (int): The root logging level
+  """
+  levels = dict((name, max(log_level, logging.INFO)) for name in _CHATTY_LOGGERS)
+  levels['botocore.credentials'] = max(log_level, logging.WARNING)
+  manager = logging.Logger.manager
+  with logging._lock: # type: ignore[attr-defined]
+    for name, level in levels.items():
+      lg = manager.loggerDict.get(name)
+      if not isinstance(lg, logging.Logger):
+        # Missing, or a PlaceHolder; getLogger() links it properly into the hierarchy
+        lg = logging.getLogger(name)
+      lg.level = level
+    manager._clear_cache() # type: ignore[attr-defined]
+
+_ENABLE_VIRTUAL_TERMINAL_PROCESSING = 0x0004
+
+def _enable_ansi_escapes(stream: TextIO) -> bool:
+  """Makes a terminal stream interpret ANSI escape sequences natively, if possible.
+
+  POSIX terminals always do. On Windows 10+, virtual terminal processing is enabled on the console.
+
+  Args:
+      stream (TextIO): A stream attached to a terminal
+
+  Returns:
+      bool: True if ANSI sequences can be written directly to the stream; False if the console
+            is a legacy Windows console that needs colorama to translate them.
+  """
+  if os.name != 'nt':
+    return True
+  try:
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+    kernel32 = ctypes.windll.kernel32 # type: ignore[attr-defined]
+    handle = msvcrt.get_osfhandle(stream.fileno()) # type: ignore[attr-defined]
+    mode = wintypes.DWORD()
+    if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+      return False
+    return bool(kernel32.SetConsoleMode(handle, mode.value | _ENABLE_VIRTUAL_TERMINAL_PROCESSING))
+  except Exception:
+    return False
+
+@functools.lru_cache(maxsize=None)
+def _is_tty(fileno: int) -> bool:
+  # isatty() is a system call; a given file descriptor is only probed once per process
+  return os.isatty(fileno)
 
 def is_colorizable(stream: TextIO) -> bool:
-  is_a_tty = hasattr(stream, 'isatty') and stream.isatty()
-  return is_a_tty
+  get_fileno = getattr(stream, 'fileno', None)
+  if get_fileno is None:
+    # Not a real file; fall back to the stream's own opinion, if it has one
+    isatty = getattr(stream, 'isatty', None)
+    return bool(isatty and isatty())
+  try:
+    fileno = get_fileno()
+  except (OSError, ValueError):
+    # e.g., io.StringIO or a closed stream
+    return False
+  return _is_tty(fileno)
 
 
 class CmdExitError(RuntimeError):
@@ -66,10 +341,35 @@ class NoExitArgumentParser(argparse.ArgumentParser):
       self._print_message(message, sys.stderr)
     raise ArgparseExitError(status, message)
 
+  if sys.version_info >= (3, 14):
+    # Python 3.14+ constructs a new HelpFormatter, probing several environment variables to decide on
+    # color, for every add_argument call just to validate metavar and help strings. Those checks do not
+    # depend on formatter state, so one formatter is reused for them. Formatters used to render help and
+    # usage accumulate state, and are still created fresh.
+    _validation_formatter: Optional[argparse.HelpFormatter] = None
+    _in_add_argument: bool = False
+
+    def add_argument(self, *args, **kwargs):
+      self._in_add_argument = True
+      try:
+        return super().add_argument(*args, **kwargs)
+      finally:
+        self._in_add_argument = False
+
+    def _get_formatter(self):
+      if not self._in_add_argument:
+        return super()._get_formatter()
+      formatter = self._validation_formatter
+      if formatter is None:
+        formatter = super()._get_formatter()
+        self._validation_formatter = formatter
+      return formatter
+
 
 class CommandLineInterface:
   _argv: Optional[Sequence[str]]
   _parser: argparse.ArgumentParser
+  _parser_cache: Optional[argparse.ArgumentParser] = None
   _args: argparse.Namespace
   _cwd: str
 
@@ -77,24 +377,23 @@ class CommandLineInterface:
   _raw_stderr: TextIO = sys.stderr
   _raw: bool = False
   _compact: bool = False
+  _pretty: bool = False
   _output_file: Optional[str] = None
   _encoding: str = 'utf-8'
 
   _colorize_stdout: bool = False
   _colorize_stderr: bool = False
 
-  _aws_session: Optional[Session] = None
-  _s3: Optional[S3Client] = None
+  # UTF-8 encoded fragments surrounding error messages; include ANSI color sequences if stderr is colorized
+  _err_prefix: bytes = b'lambda-venv: error: '
+  _err_suffix: bytes = b'\n'
+
+  _aws_session: Optional['Session'] = None
+  _s3: Optional['S3Client'] = None
 
   def __init__(self, argv: Optional[Sequence[str]]=None):
     self._argv = argv
 
-  def ocolor(self, codes: str) -> str:
-    return codes if self._colorize_stdout else ""
-
-  def ecolor(self, codes: str) -> str:
-    return codes if self._colorize_stderr else ""
-
   @property
   def cwd(self) -> str:
     return self._cwd
@@ -102,14 +401,14 @@ class CommandLineInterface:
   def abspath(self, path: str) -> str:
     return os.path.abspath(os.path.join(self.cwd, os.path.expanduser(path)))
 
-  def get_aws_session(self) -> Session:
+  def get_aws_session(self) -> 'Session':
     if self._aws_session is None:
-      self._aws_session = create_aws_session(profile_name=self._args.aws_profile, region_name=self._args.aws_region)
+      self._aws_session = _cached_aws_session(self._args.aws_profile, self._args.aws_region)
     return self._aws_session
 
-  def get_s3(self) -> S3Client:
+  def get_s3(self) -> 'S3Client':
     if self._s3 is None:
-      self._s3 = self.get_aws_session().client('s3')
+      self._s3 = _cached_s3(self._args.aws_profile, self._args.aws_region)
     return self._s3
 
   def pretty_print(
@@ -118,6 +417,7 @@ class CommandLineInterface:
         compact: Optional[bool]=None,
         colorize: Optional[bool]=None,
         raw: Optional[bool]=None,
+        pretty: Optional[bool]=None,
       ):
 
     if raw is None:
@@ -131,27 +431,20 @@ class CommandLineInterface:
       compact = self._compact
     if colorize is None:
       colorize = True
+    if pretty is None:
+      pretty = self._pretty
 
     def emit_to(f: TextIO):
       final_colorize = colorize and ((f is sys.stdout and self._colorize_stdout) or (f is sys.stderr and self._colorize_stderr))
 
-      if not final_colorize:
-        if compact:
-          json.dump(value, f, separators=(',', ':'), sort_keys=True)
-        else:
-          json.dump(value, f, indent=2, sort_keys=True)
+      # Indentation is only useful to a human at a terminal; unless explicitly requested, emit compact JSON
+      # to files and pipes
+      effective_compact = compact or (not pretty and not final_colorize and not is_colorizable(f))
+      if final_colorize:
+        _emit_colored_json(f, value, compact=effective_compact, ascii_only=_needs_ascii_escape(f))
         f.write('\n')
       else:
-        jq_input = json.dumps(value, separators=(',', ':'), sort_keys=True)
-        cmd = [ 'jq' ]
-        if compact:
-          cmd.append('-c')
-        cmd.append('.')
-        with subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=f) as proc:
-          proc.communicate(input=jq_input.encode('utf-8'))
-          exit_code = proc.returncode
-        if exit_code != 0:
-          raise subprocess.CalledProcessError(exit_code, cmd)
+        _write_utf8(f, _dumps_line(value, compact=effective_compact))
 
     output_file = self._output_file
     if output_file is None:
@@ -165,7 +458,11 @@ class CommandLineInterface:
     return 1
 
   def cmd_version(self) -> int:
-    self.pretty_print(pkg_version)
+    if self._output_file is None and not self._colorize_stdout:
+      # Nothing to colorize or indent for a plain version string; skip the general pretty_print path
+      self._raw_stdout.write(pkg_version if self._raw else f'"{pkg_version}"\n')
+    else:
+      self.pretty_print(pkg_version)
     return 0
 
   def cmd_test(self) -> int:
@@ -175,31 +472,34 @@ class CommandLineInterface:
 
     return 0
 
-  def run(self) -> int:
-    """Run the commandline tool with provided arguments
+  @classmethod
+  def _build_parser(cls) -> argparse.ArgumentParser:
+    """Returns the argument parser for this class, building it on first use.
 
-    Args:
-        argv (Optional[Sequence[str]], optional):
-            A list of commandline arguments (NOT including the program as argv[0]!),
-            or None to use sys.argv[1:]. Defaults to None.
-
-    Returns:
-        int: The exit code that would be returned if this were run as a standalone command.
+    The parser does not depend on per-instance state, so it is shared by all
+    instances of the class; each subclass gets its own. Command handlers are
+    registered as unbound methods and are invoked with the instance.
     """
-    parser = argparse.ArgumentParser(description="AWS lambda virtualenv management tool.")
+    parser = cls.__dict__.get('_parser_cache')
+    if parser is not None:
+      return parser
+
+    parser = NoExitArgumentParser(description="AWS lambda virtualenv management tool.")
 
     # ======================= Main command
 
-    self._parser = parser
     parser.add_argument('--traceback', "--tb", action='store_true', default=False,
                         help='Display detailed exception information')
-    parser.add_argument('--loglevel', default='warning',
-                        choices=['critical', 'error', 'warning', 'info', 'debug'],
+    loglevel_action = parser.add_argument('--loglevel', default=logging.WARNING, type=_parse_loglevel,
+                        metavar='{' + ','.join(_LOG_LEVELS) + '}',
                         help='Set the logging level. Default is "warning"')
+    loglevel_action.completer = _complete_loglevel # type: ignore[attr-defined]
     parser.add_argument('-M', '--monochrome', action='store_true', default=False,
                         help='Output to stdout/stderr in monochrome. Default is to colorize if stream is a compatible terminal')
     parser.add_argument('-c', '--compact', action='store_true', default=False,
                         help='Compact instead of pretty-printed output')
+    parser.add_argument('--pretty', action='store_true', default=False,
+                        help='Pretty-print output even if it is not going to a terminal. Default is to pretty-print only to a terminal')
     parser.add_argument('-r', '--raw', action='store_true', default=False,
                         help='''Output raw strings and binary content directly, not json-encoded.
                                 Values embedded in structured results are not affected.''')
@@ -215,7 +515,7 @@ class CommandLineInterface:
                         help='The AWS region to use. Default is to use the default AWS region for the selected profile')
     parser.add_argument('-e', '--venv', dest='venv_dir', default=None,
                         help='The directory containing the virtualenv. By default')
-    parser.set_defaults(func=self.cmd_bare)
+    parser.set_defaults(func=cls.cmd_bare)
 
     subparsers = parser.add_subparsers(
                         title='Commands',
@@ -226,31 +526,45 @@ class CommandLineInterface:
 
     parser_version = subparsers.add_parser('version',
                             description='''Display version information. JSON-quoted string. If a raw string is desired, use -r.''')
-    parser_version.set_defaults(func=self.cmd_version)
+    parser_version.set_defaults(func=cls.cmd_version)
 
     # ======================= test
 
     parser_test = subparsers.add_parser('test', description="Run a simple test. For debugging only.  Will be removed.")
-    parser_test.set_defaults(func=self.cmd_test)
+    parser_test.set_defaults(func=cls.cmd_test)
 
     # =========================================================
 
-    argcomplete.autocomplete(parser)
+    cls._parser_cache = parser
+    return parser
+
+  def run(self) -> int:
+    """Run the commandline tool with provided arguments
+
+    Args:
+        argv (Optional[Sequence[str]], optional):
+            A list of commandline arguments (NOT including the program as argv[0]!),
+            or None to use sys.argv[1:]. Defaults to None.
+
+    Returns:
+        int: The exit code that would be returned if this were run as a standalone command.
+    """
+    parser = self._build_parser()
+    self._parser = parser
+
+    if '_ARGCOMPLETE' in os.environ:
+      # argcomplete only has work to do when invoked by shell completion
+      import argcomplete # type: ignore[import]
+      argcomplete.autocomplete(parser)
     try:
       args = parser.parse_args(self._argv)
     except ArgparseExitError as ex:
       return ex.exit_code
-    logging.basicConfig(level=args.loglevel.upper())
-    logLevel = logging.getLogger().level
+    logLevel: int = args.loglevel
+    logging.basicConfig(level=logLevel)
     # Restrict loglevel of boto3 and urllib3 modules because they are very chatty
     # and it is hard to find our log messages amongst the noise
-    for modname in [
-      'botocore.hooks','botocore.parsers','botocore.auth','botocore.endpoint','botocore.httpsession',
-      'botocore.loaders','botocore.retryhandler','botocore.utils','botocore.client',
-      'botocore.session','botocore.handlers','botocore.awsrequest','botocore.regions','urllib3.connectionpool',
-      's3transfer.utils','s3transfer.tasks','s3transfer.futures']:
-      logging.getLogger(modname).setLevel(max(logLevel, logging.INFO))
-    logging.getLogger('botocore.credentials').setLevel(max(logLevel, logging.WARNING))
+    _set_logger_levels(logLevel)
     traceback: bool = args.traceback
     try:
       self._args = args
@@ -258,24 +572,34 @@ class CommandLineInterface:
       self._raw_stderr = sys.stderr
       self._raw = args.raw
       self._compact = args.compact
+      self._pretty = args.pretty
       self._output_file = args.output_file
       self._encoding = args.text_encoding
       monochrome: bool = args.monochrome
       if not monochrome:
         self._colorize_stdout = is_colorizable(sys.stdout)
         self._colorize_stderr = is_colorizable(sys.stderr)
-        if self._colorize_stdout or self._colorize_stderr:
+        # Wrapping a stream with colorama puts a Python-level ANSI parser in front of every write; it is
+        # only needed for legacy Windows consoles that cannot be switched to virtual terminal mode.
+        wrap_stdout = self._colorize_stdout and not _enable_ansi_escapes(sys.stdout)
+        wrap_stderr = self._colorize_stderr and not _enable_ansi_escapes(sys.stderr)
+        if wrap_stdout or wrap_stderr:
+          import colorama # type: ignore[import]
           colorama.init(wrap=False)
-          if self._colorize_stdout:
+          if wrap_stdout:
             new_stream = colorama.AnsiToWin32(sys.stdout)
             if new_stream.should_wrap():
               sys.stdout = new_stream
-          if self._colorize_stderr:
+          if wrap_stderr:
             new_stream = colorama.AnsiToWin32(sys.stderr)
             if new_stream.should_wrap():
               sys.stderr = new_stream
+        if self._colorize_stderr:
+          from colorama import Fore, Style # type: ignore[import]
+          self._err_prefix = Fore.RED.encode('utf-8') + type(self)._err_prefix
+          self._err_suffix = Style.RESET_ALL.encode('utf-8') + type(self)._err_suffix
       self._cwd = os.path.abspath(os.path.expanduser(args.cwd))
-      rc = args.func()
+      rc = args.func(self)
     except Exception as ex:
       if isinstance(ex, CmdExitError):
         rc = ex.exit_code
@@ -285,7 +609,16 @@ class CommandLineInterface:
         if traceback:
           raise
 
-        print(f"{self.ecolor(Fore.RED)}lambda-venv: error: {ex}{self.ecolor(Style.RESET_ALL)}", file=sys.stderr)
+        stderr_buffer = getattr(sys.stderr, 'buffer', None)
+        if (stderr_buffer is None or sys.stderr is not self._raw_stderr or not _BINARY_NEWLINES_MATCH_TEXT
+            or not _is_utf8_encoding(getattr(sys.stderr, 'encoding', None))):
+          # No binary layer, stderr is wrapped (e.g., by colorama) and must see the text, or stderr
+          # must do its own encoding or newline translation
+          print(f"{self._err_prefix.decode('utf-8')}{ex}{self._err_suffix.decode('utf-8')}", file=sys.stderr, end='')
+        else:
+          sys.stderr.flush()
+          stderr_buffer.writelines((self._err_prefix, str(ex).encode('utf-8', 'replace'), self._err_suffix))
+          stderr_buffer.flush()
     return rc
 
   @property
@@ -308,4 +641,5 @@ class CommandHandler:
     self.args = cli.args
 
   def __call__(self) -> int:
+    from .util import full_type
     raise NotImplementedError(f"{full_type(self)} has not implemented __call__")
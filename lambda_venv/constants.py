@@ -6,3 +6,5 @@
 """Constants used by this package"""
 
 DEFAULT_AWS_PROFILE = 'amigos'
+
+__all__ = [ 'DEFAULT_AWS_PROFILE' ]
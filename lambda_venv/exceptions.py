@@ -13,3 +13,5 @@ from .internal_types import JsonableDict
 class LambdaVenvError(Exception):
   """Base class for all error exceptions defined by this package."""
   #pass
+
+__all__ = [ 'LambdaVenvError' ]